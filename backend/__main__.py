@@ -0,0 +1,17 @@
+"""
+Development entry point: run the backend with `python -m backend` from the project root.
+"""
+
+import uvicorn
+
+if __name__ == "__main__":
+    # Run the server (uvloop + httptools when installed, asyncio + h11 otherwise)
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        reload=True,
+        log_level="info"
+    )
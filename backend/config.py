@@ -1,9 +1,14 @@
 import os
 import sys
 import yaml
+import orjson
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import requests
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
 
 class Config:
     """Configuration management for Echo exam platform"""
@@ -24,10 +29,27 @@ class Config:
         "qwen2.5-omni-7b": ["Ethan", "Chelsie"]
     }
 
+    # Request body for test_api_connection, serialized once
+    _TEST_PAYLOAD = orjson.dumps({
+        "model": "qwen3-omni-flash",
+        "messages": [
+            {
+                "role": "user",
+                "content": [{
+                    "type": "text",
+                    "text": "connection test. Return 'copy'."
+                }]
+            }
+        ],
+        "stream": True,
+        "modalities": ["text"]
+    })
+
   
     def __init__(self):
         self.config_file = self._get_config_path()
         self.config = self._load_default_config()
+        self._all_json: Optional[bytes] = None  # Serialized config, reset on every change
         self.load()
 
     @staticmethod
@@ -35,15 +57,8 @@ class Config:
         """Get the configuration file path"""
         if getattr(sys, 'frozen', False):
             # Running as PyInstaller bundle - use AppData location
-            import os
-            if os.name == 'nt':  # Windows
-                appdata = os.environ.get('LOCALAPPDATA')
-                if appdata:
-                    return Path(appdata) / "Echo" / "config.yaml"
-                else:
-                    return Path.home() / "AppData" / "Local" / "Echo" / "config.yaml"
-            else:
-                return Path.home() / ".echo" / "config.yaml"
+            from .paths import get_app_data_path
+            return get_app_data_path() / "config.yaml"
         else:
             # Running in development environment
             return Path(__file__).parent.parent / "config.yaml"
@@ -52,7 +67,8 @@ class Config:
         """Load default configuration"""
         return {
             "api": {
-                "dashscope_key": ""
+                "dashscope_key": "",
+                "max_concurrent_requests": 4
             },
             "models": {
                 "omni_model": "qwen3-omni-flash",
@@ -76,10 +92,13 @@ class Config:
         if self.config_file.exists():
             try:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = yaml.safe_load(f)
+                    loaded_config = yaml.load(f, Loader=SafeLoader)
                     if loaded_config:
                         # Merge with defaults to ensure all keys exist
                         self._merge_config(self.config, loaded_config)
+                        # config.yaml is hand-editable, so it bypasses validate()
+                        self.set("api.max_concurrent_requests",
+                                 self.clamp_max_concurrent_requests(self.get("api.max_concurrent_requests")))
             except Exception as e:
                 print(f"Failed to load config file: {e}")
                 print("Using default configuration")
@@ -88,7 +107,7 @@ class Config:
         """Save configuration to file"""
         try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                yaml.dump(self.config, f, default_flow_style=False, allow_unicode=True, indent=2)
+                yaml.dump(self.config, f, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True, indent=2)
             return True
         except Exception as e:
             print(f"Failed to save config file: {e}")
@@ -114,11 +133,25 @@ class Config:
                 config[k] = {}
             config = config[k]
         config[keys[-1]] = value
+        self._all_json = None
+
+    @staticmethod
+    def clamp_max_concurrent_requests(value: Any) -> int:
+        """Clamp the request limit to 1-16, falling back to 4 if it isn't an integer"""
+        if isinstance(value, bool) or not isinstance(value, int):
+            return 4
+        return min(max(value, 1), 16)
 
     def get_all(self) -> Dict[str, Any]:
         """Get all configuration"""
         return self.config.copy()
 
+    def get_all_json(self) -> bytes:
+        """Get all configuration as JSON bytes, cached until the configuration changes"""
+        if self._all_json is None:
+            self._all_json = orjson.dumps(self.config)
+        return self._all_json
+
     def update(self, new_config: Dict[str, Any]) -> Dict[str, Any]:
         """Update configuration with validation"""
         errors = self.validate(new_config)
@@ -126,6 +159,7 @@ class Config:
             return {"success": False, "errors": errors}
 
         self._merge_config(self.config, new_config)
+        self._all_json = None
         if self.save():
             return {"success": True, "config": self.config}
         else:
@@ -149,6 +183,10 @@ class Config:
                 api_key = config["api"]["dashscope_key"]
                 if api_key and not api_key.startswith("sk-"):
                     errors.append("API key must start with 'sk-'")
+            if "max_concurrent_requests" in config["api"]:
+                limit = config["api"]["max_concurrent_requests"]
+                if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1 or limit > 16:
+                    errors.append("Max concurrent requests must be between 1 and 16")
 
         # Validate model selection
         if "models" in config:
@@ -202,38 +240,27 @@ class Config:
                 "Content-Type": "application/json"
             }
 
-            test_payload = {
-                "model": "qwen3-omni-flash",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [{
-                            "type": "text",
-                            "text": "connection test. Return 'copy'."
-                        }]
-                    }
-                ],
-                "stream": True,
-                "modalities": ["text"]
-            }
-
             try:
                 # Try with SSL verification first
                 response = requests.post(
                     "https://dashscope.aliyuncs.com/compatible-mode/v1/chat/completions",
                     headers=headers,
-                    json=test_payload,
-                    timeout=10
+                    data=self._TEST_PAYLOAD,
+                    timeout=10,
+                    stream=True
                 )
             except requests.exceptions.SSLError:
                 # Fallback without SSL verification for PyInstaller environments
                 response = requests.post(
                     "https://dashscope.aliyuncs.com/compatible-mode/v1/chat/completions",
                     headers=headers,
-                    json=test_payload,
+                    data=self._TEST_PAYLOAD,
                     timeout=10,
+                    stream=True,
                     verify=False
                 )
+            # Only the status matters, so don't wait for the streamed completion
+            response.close()
 
             if response.status_code == 200:
                 return {"success": True, "message": "API connection successful"}
@@ -1,3 +1,4 @@
+import os
 import yaml
 import json
 import uuid
@@ -6,23 +7,35 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 try:
-    from .models import (
-        Question, Exam, SectionInstruction, GradingInput, GradingResult, TTSInput, AudioGenerationStatus,
-        SessionStartRequest, SessionResponse, QuestionResponse, AnswerSubmission,
-        AnswerResponse, FinalResult
-    )
-    from .omni_client import OmniClient
-    from .config import config
-    from .paths import get_paths
+    # libyaml-backed loader is several times faster than the pure-Python one
+    from yaml import CSafeLoader as SafeLoader
 except ImportError:
-    from models import (
-        Question, Exam, SectionInstruction, GradingInput, GradingResult, TTSInput, AudioGenerationStatus,
-        SessionStartRequest, SessionResponse, QuestionResponse, AnswerSubmission,
-        AnswerResponse, FinalResult
-    )
-    from omni_client import OmniClient
-    from config import config
-    from paths import get_paths
+    from yaml import SafeLoader
+from .models import (
+    Question, Exam, SectionInstruction, GradingInput, GradingResult, TTSInput, AudioGenerationStatus,
+    SessionStartRequest, SessionResponse, QuestionResponse, AnswerSubmission,
+    AnswerResponse, FinalResult
+)
+from .omni_client import get_omni_client
+from .config import config
+from .paths import get_paths
+
+
+class ExamError(ValueError):
+    """Exam session error; the API responds with its status_code"""
+    status_code = 500
+
+
+class SessionNotFound(ExamError):
+    status_code = 400
+
+
+class NoMoreQuestions(ExamError):
+    status_code = 404
+
+
+class NoCurrentQuestion(ExamError):
+    status_code = 404
 
 
 class ExamSession:
@@ -101,16 +114,15 @@ class ExamSession:
 class ExamManager:
     def __init__(self):
         self.sessions: Dict[str, ExamSession] = {}
-        self._omni_client = None
         paths = get_paths()
         self.completed_exams_file = paths.completed_exams_file
         self._completed_exams = self._load_completed_exams()
+        self._exam_list_cache = None  # (exams dir mtime_ns, sorted exam file names)
+        self._exam_cache: Dict[str, tuple] = {}  # file path -> ((mtime_ns, size), parsed Exam)
 
     def get_omni_client(self):
-        """Get or create OmniClient instance (lazy initialization)"""
-        if self._omni_client is None:
-            self._omni_client = OmniClient(config.get("models.omni_model", "qwen3-omni-flash"))
-        return self._omni_client
+        """Get the shared OmniClient for the configured omni model"""
+        return get_omni_client(config.get("models.omni_model", "qwen3-omni-flash"))
 
     def has_api_key(self):
         """Check if API key is configured"""
@@ -165,8 +177,8 @@ class ExamManager:
     
     async def start_session(self, request: SessionStartRequest) -> SessionResponse:
         """Start a new exam session"""
-        # Load exam from YAML file
-        exam = await self._load_exam_from_yaml(request.exam_file_path)
+        # Load exam from YAML file (off the event loop)
+        exam = await asyncio.to_thread(self._load_exam_from_yaml, request.exam_file_path)
         
         # Create session
         session_id = str(uuid.uuid4())
@@ -189,7 +201,7 @@ class ExamManager:
         question = session.get_current_question()
 
         if question is None:
-            raise ValueError("No more questions available")
+            raise NoMoreQuestions("No more questions available")
 
         audio_file_path = session.audio_files.get(question.id)
 
@@ -220,11 +232,11 @@ class ExamManager:
         question = session.get_current_question()
 
         if question is None:
-            raise ValueError("No current question to answer")
+            raise NoCurrentQuestion("No current question to answer")
 
         # Check if API key is configured for processing
         if not self.has_api_key():
-            raise ValueError("API key not configured. Please configure API key in settings.")
+            raise ExamError("API key not configured. Please configure API key in settings.")
 
         # Check if this is the last question
         is_last_question = session.current_question_index == len(session.exam.questions) - 1
@@ -321,20 +333,26 @@ class ExamManager:
             total_questions=len(session.exam.questions)
         )
     
-    async def list_available_exams(self, include_completed: bool = True) -> List[str]:
+    def list_available_exams(self, include_completed: bool = True) -> List[str]:
         """List available exam files with optional filtering of completed exams"""
         paths = get_paths()
         exam_dir = paths.exams_dir
-        if not exam_dir.exists():
+        try:
+            dir_mtime = exam_dir.stat().st_mtime_ns
+        except FileNotFoundError:
             return []
 
-        exam_files = []
-        for file in exam_dir.glob("*.yaml"):
-            exam_files.append(file.name)
-        for file in exam_dir.glob("*.yml"):
-            exam_files.append(file.name)
+        # Adding, renaming or deleting an exam file bumps the directory mtime,
+        # so only rescan the directory when it has changed
+        if self._exam_list_cache is None or self._exam_list_cache[0] != dir_mtime:
+            with os.scandir(exam_dir) as entries:
+                exam_files = sorted(
+                    entry.name for entry in entries
+                    if entry.name.endswith(('.yaml', '.yml')) and entry.is_file()
+                )
+            self._exam_list_cache = (dir_mtime, exam_files)
 
-        exam_files = sorted(exam_files)
+        exam_files = list(self._exam_list_cache[1])
 
         # Filter out completed exams if requested
         if not include_completed:
@@ -343,15 +361,29 @@ class ExamManager:
 
         return exam_files
     
-    async def _load_exam_from_yaml(self, file_path: str) -> Exam:
+    def _load_exam_from_yaml(self, file_path: str) -> Exam:
         """Load exam from YAML file and sort questions by type"""
         paths = get_paths()
         full_path = paths.exams_dir / file_path
-        if not full_path.exists():
+        try:
+            stat = full_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Exam file not found: {file_path}")
 
+        # Sessions never modify their Exam, so an unchanged file can share one instance
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._exam_cache.get(file_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        exam = self._parse_exam_file(full_path)
+        self._exam_cache[file_path] = (key, exam)
+        return exam
+
+    def _parse_exam_file(self, full_path: Path) -> Exam:
+        """Parse an exam YAML file into an Exam with questions sorted by type"""
         with open(full_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
 
         if 'exam' in data:
             exam_data = data['exam']
@@ -414,29 +446,29 @@ class ExamManager:
         instruction_voice = config.get("models.instruction_voice", "Cherry")
         response_voice = config.get("models.response_voice", "Cherry")
 
-        # Generate audio for section instructions
+        # Collect every clip first: (audio_files key, text, voice, label for logging)
+        tts_jobs = []
+
+        # Section instructions, stored with section_type prefix to avoid conflicts
         for section_type, instruction in session.exam.section_instructions.items():
             if instruction.tts:
-                try:
-                    tts_request = TTSInput(text=instruction.tts, voice=instruction_voice)
-                    tts_result = await self.get_omni_client().text_to_speech(tts_request)
-                    # Store with section_type prefix to avoid conflicts
-                    audio_files[f"section_{section_type}"] = tts_result.audio_file_path
-                    print(f"Generated audio for {section_type} instruction: {tts_result.audio_file_path}")
-                except Exception as e:
-                    print(f"Failed to generate audio for {section_type} instruction: {e}")
-
-        # Generate audio for questions that need TTS (quick_response questions have text=TTS)
+                tts_jobs.append((f"section_{section_type}", instruction.tts, instruction_voice, f"{section_type} instruction"))
+
+        # Questions that need TTS (quick_response questions have text=TTS)
         for question in session.exam.questions:
             if question.type == 'quick_response':
-                # For quick response, the text is the question audio
-                try:
-                    tts_request = TTSInput(text=question.text, voice=response_voice)
-                    tts_result = await self.get_omni_client().text_to_speech(tts_request)
-                    audio_files[question.id] = tts_result.audio_file_path
-                    print(f"Generated audio for quick_response question {question.id}: {tts_result.audio_file_path}")
-                except Exception as e:
-                    print(f"Failed to generate audio for question {question.id}: {e}")
+                tts_jobs.append((question.id, question.text, response_voice, f"quick_response question {question.id}"))
+
+        async def generate(key: str, text: str, voice: str, label: str):
+            try:
+                tts_result = await self.get_omni_client().text_to_speech(TTSInput(text=text, voice=voice))
+                audio_files[key] = tts_result.audio_file_path
+                print(f"Generated audio for {label}: {tts_result.audio_file_path}")
+            except Exception as e:
+                print(f"Failed to generate audio for {label}: {e}")
+
+        # Run them concurrently; the client's request semaphore caps how many reach the API at once
+        await asyncio.gather(*(generate(*job) for job in tts_jobs))
 
         session.audio_files = audio_files
     
@@ -477,5 +509,5 @@ class ExamManager:
     def _get_session(self, session_id: str) -> ExamSession:
         """Get session by ID"""
         if session_id not in self.sessions:
-            raise ValueError(f"Session not found: {session_id}")
+            raise SessionNotFound(f"Session not found: {session_id}")
         return self.sessions[session_id]
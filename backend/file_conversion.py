@@ -1,6 +1,4 @@
-import base64
 import io
-import sys
 import markdown
 import yaml
 import traceback
@@ -10,17 +8,19 @@ from docx import Document
 from PIL import Image
 from typing import List, Dict, Optional
 from pathlib import Path
-
 try:
-    from .models import ConversionInput, ConversionResult, FileConversionRequest, FileConversionResponse, Question
-    from .omni_client import OmniClient
-    from .config import config
-    from .paths import get_paths
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+try:
+    import pybase64 as base64
 except ImportError:
-    from models import ConversionInput, ConversionResult, FileConversionRequest, FileConversionResponse, Question
-    from omni_client import OmniClient
-    from config import config
-    from paths import get_paths
+    import base64
+
+from .models import ConversionInput, ConversionResult, FileConversionRequest, FileConversionResponse, Question
+from .omni_client import get_omni_client
+from .config import config
+from .paths import get_paths
 
 class FileParser:
     """
@@ -33,6 +33,7 @@ class FileParser:
     """
 
     SUPPORTED_FORMATS = {'.txt', '.md', '.docx', '.jpg', '.jpeg', '.png', '.pdf'}
+    MAX_TOTAL_SIZE = 10 * 1024 * 1024
 
     @staticmethod
     def extract_text_from_txt(base64_content: str) -> str:
@@ -113,7 +114,12 @@ class FileParser:
                 raise ValueError(f"Unsupported file extension for '{filename}': {ext}. Supported formats: {cls.SUPPORTED_FORMATS}")
             extensions.append(ext)
 
-        # 2. parse each file based on extension
+        # 2. check decoded upload size before decoding anything into memory
+        upload_size = sum(len(content) * 3 // 4 for content in file_contents)
+        if upload_size > cls.MAX_TOTAL_SIZE:
+            raise ValueError("File(s) too large. Recommend to upload files of total size <= 6MB")
+
+        # 3. parse each file based on extension
         texts = []
         images = []
         try:
@@ -138,11 +144,6 @@ class FileParser:
                 f"Stack trace:\n{stack_trace}"
             )
 
-        # 3. examine total image size
-        size = sys.getsizeof(images)
-        if size > 10 * 1024 * 1024:
-            raise ValueError("File(s) too large. Recommend to upload files of total size <= 6MB")
-        
         return ConversionInput(
             texts=texts,
             images=images
@@ -153,14 +154,9 @@ class FileParser:
 class FileConverter:
     """File converter that handles the complete conversion pipeline"""
 
-    def __init__(self):
-        self._vl_client = None
-
     def get_vl_client(self):
-        """Get or create OmniClient instance (lazy initialization)"""
-        if self._vl_client is None:
-            self._vl_client = OmniClient(config.get("models.vision_model", "qwen3-vl-plus"))
-        return self._vl_client
+        """Get the shared OmniClient for the configured vision model"""
+        return get_omni_client(config.get("models.vision_model", "qwen3-vl-plus"))
 
     def _generate_yaml_content(self, original_filenames: List[str], questions: List[Question]) -> str:
         """Generate YAML content from extracted questions"""
@@ -211,6 +207,7 @@ class FileConverter:
         # Generate YAML content
         return yaml.dump(
             exam_data,
+            Dumper=SafeDumper,
             default_flow_style=False,
             allow_unicode=True,
             indent=2,
@@ -263,7 +260,7 @@ class FileConverter:
             output_filename=str(output_path)
         )
 
-    async def rename_exam_file(self, old_name: str, new_name: str) -> dict:
+    def rename_exam_file(self, old_name: str, new_name: str) -> dict:
         """Rename an exam file in the exams directory"""
         from pathlib import Path
 
@@ -299,7 +296,7 @@ class FileConverter:
         except Exception as e:
             raise Exception(f"Failed to rename file: {str(e)}")
 
-    async def delete_exam_file(self, exam_filename: str) -> dict:
+    def delete_exam_file(self, exam_filename: str) -> dict:
         """Delete an exam file from the exams directory"""
         from pathlib import Path
 
@@ -335,7 +332,6 @@ class FileConverter:
 
 if __name__ == "__main__":
     import asyncio
-    import base64
     from pathlib import Path
 
     async def test_convert_files():
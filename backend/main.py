@@ -1,39 +1,57 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-import uvicorn
+import asyncio
+import logging
+import orjson
 import os
 import sys
 from pathlib import Path
 
 # Import our modules
-try:
-    from .models import (
-        SessionStartRequest, SessionResponse, QuestionResponse,
-        AnswerSubmission, AnswerResponse, FinalResult,
-        FileConversionRequest, FileConversionResponse
-    )
-    from .exam_logic import ExamManager
-    from .file_conversion import FileConverter
-    from .config import config
-except ImportError:
-    from models import (
-        SessionStartRequest, SessionResponse, QuestionResponse,
-        AnswerSubmission, AnswerResponse, FinalResult,
-        FileConversionRequest, FileConversionResponse
-    )
-    from exam_logic import ExamManager
-    from file_conversion import FileConverter
-    from config import config
+from .models import (
+    SessionStartRequest, SessionResponse, QuestionResponse,
+    AnswerSubmission, AnswerResponse, FinalResult,
+    FileConversionRequest, FileConversionResponse,
+    RenameExamRequest, DeleteExamRequest, UpdateSettingsRequest, TestApiRequest
+)
+from .exam_logic import ExamManager, ExamError
+from .file_conversion import FileConverter
+from .omni_client import close_omni_clients
+from .config import config
+
+# Log through uvicorn's error logger so messages share its format and level
+logger = logging.getLogger("uvicorn.error")
+
+class OrjsonResponse(Response):
+    """JSON response encoded with orjson (FastAPI's own ORJSONResponse is deprecated)"""
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-open the API connection on startup and close pooled connections on shutdown"""
+    # Runs in the background so startup (and the Tauri health check) isn't held up by the network
+    warm_up_task = None
+    if exam_manager.has_api_key():
+        warm_up_task = asyncio.create_task(exam_manager.get_omni_client().warm_up())
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    await close_omni_clients()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Echo - LLM-Powered Exam Platform API",
     description="API for managing and taking English+Math exams for Chinese students",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=OrjsonResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware for frontend integration
@@ -45,40 +63,82 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class JSONGZipMiddleware:
+    """GZip responses, except already-compressed audio under /audio_cache"""
+
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 5):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/audio_cache"):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip_app(scope, receive, send)
+
+
+# Compress JSON payloads (exam lists, results, settings) larger than 1KB
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for files that never change once written, cached by browsers for a year"""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+class FrontendStaticFiles(StaticFiles):
+    """SPA files; Vite's content-hashed assets/ are cached for good, index.html is always revalidated"""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200 and path.startswith("assets" + os.sep):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 # Initialize managers
 exam_manager = ExamManager()
 file_converter = FileConverter()
 
 # Import paths after module initialization
-try:
-    from .paths import get_paths
-except ImportError:
-    from paths import get_paths
+from .paths import get_paths
 
-# Mount static files for audio cache
+# Mount static files for audio cache. TTS files are named by a hash of their
+# content and student recordings by question id + timestamp, so neither changes
 paths = get_paths()
-app.mount("/audio_cache", StaticFiles(directory=str(paths.audio_cache)), name="audio_cache")
+app.mount("/audio_cache", ImmutableStaticFiles(directory=str(paths.audio_cache)), name="audio_cache")
+
+# Constant JSON payloads, serialized once at import
+_API_INFO_BYTES = orjson.dumps({
+    "message": "Echo - LLM-Powered Exam Platform API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "endpoints": {
+        "exams": "/exams/list",
+        "session": "/session/start",
+        "health": "/health"
+    }
+})
+_HEALTH_BYTES = orjson.dumps({"status": "healthy"})
+_SETTINGS_OPTIONS_BYTES = orjson.dumps({
+    "omni_models": config.OMNI_MODELS,
+    "vision_models": config.VISION_MODELS,
+    "voice_options": config.VOICE_OPTIONS
+})
 
 # API info endpoint (moved from root to avoid conflict with frontend)
 @app.get("/api/info")
 async def api_info():
     """API information endpoint"""
-    return {
-        "message": "Echo - LLM-Powered Exam Platform API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "endpoints": {
-            "exams": "/exams/list",
-            "session": "/session/start",
-            "health": "/health"
-        }
-    }
+    return Response(content=_API_INFO_BYTES, media_type="application/json")
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 # API key status endpoint
 @app.get("/api-key-status")
@@ -96,12 +156,15 @@ async def api_key_status():
             "message": f"Error checking API key: {str(e)}"
         }
 
+# Endpoints doing blocking file or network I/O are plain `def` so FastAPI runs
+# them in its threadpool instead of stalling the event loop
+
 # List available exams
 @app.get("/exams/list")
-async def list_exams(include_completed: bool = True):
+def list_exams(include_completed: bool = True):
     """List available exam YAML files with optional filtering"""
     try:
-        exams = await exam_manager.list_available_exams(include_completed)
+        exams = exam_manager.list_available_exams(include_completed)
         return {"exams": exams}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing exams: {str(e)}")
@@ -131,63 +194,31 @@ async def start_session(request: SessionStartRequest):
 @app.get("/session/{session_id}/question", response_model=QuestionResponse)
 async def get_question(session_id: str):
     """Get the current question for a session"""
-    try:
-        return await exam_manager.get_current_question(session_id)
-    except ValueError as e:
-        if "No more questions available" in str(e):
-            raise HTTPException(status_code=404, detail=str(e))
-        elif "Session not found" in str(e):
-            raise HTTPException(status_code=400, detail=str(e))
-        else:
-            raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting question: {str(e)}")
+    # Dump to plain Python types and let orjson encode them directly,
+    # skipping FastAPI's response_model revalidation and jsonable_encoder
+    result = await exam_manager.get_current_question(session_id)
+    return OrjsonResponse(result.model_dump())
 
 # Submit answer
 @app.post("/session/{session_id}/answer", response_model=AnswerResponse)
 async def submit_answer(session_id: str, answer_data: AnswerSubmission):
     """Submit an answer for the current question"""
-    try:
-        return await exam_manager.submit_answer(session_id, answer_data)
-    except ValueError as e:
-        if "Session not found" in str(e):
-            raise HTTPException(status_code=400, detail=str(e))
-        elif "No current question" in str(e):
-            raise HTTPException(status_code=404, detail=str(e))
-        else:
-            raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error submitting answer: {str(e)}")
+    return await exam_manager.submit_answer(session_id, answer_data)
 
 # Get audio generation status
 @app.get("/session/{session_id}/audio-status")
 async def get_audio_generation_status(session_id: str):
     """Get the audio generation status for a session"""
-    try:
-        return await exam_manager.get_audio_generation_status(session_id)
-    except ValueError as e:
-        if "Session not found" in str(e):
-            raise HTTPException(status_code=400, detail=str(e))
-        else:
-            raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting audio generation status: {str(e)}")
+    return await exam_manager.get_audio_generation_status(session_id)
 
 # Get final results
 @app.get("/session/{session_id}/results", response_model=FinalResult)
 async def get_results(session_id: str):
     """Get the final exam results"""
-    try:
-        return await exam_manager.get_final_results(session_id)
-    except ValueError as e:
-        if "Session not found" in str(e):
-            raise HTTPException(status_code=400, detail=str(e))
-        elif "Exam not completed" in str(e):
-            raise HTTPException(status_code=400, detail=str(e))
-        else:
-            raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting results: {str(e)}")
+    result = await exam_manager.get_final_results(session_id)
+    # question_results is already a list of plain dicts, so a shallow field
+    # copy is enough for orjson; model_dump would walk and rebuild every item
+    return OrjsonResponse(dict(result))
 
 # File conversion endpoint
 @app.post("/convert/file", response_model=FileConversionResponse)
@@ -200,30 +231,19 @@ async def convert_file(request: FileConversionRequest):
 
 # Rename exam file endpoint
 @app.post("/rename-exam")
-async def rename_exam(request: dict):
+def rename_exam(request: RenameExamRequest):
     """Rename an exam file in the exams directory"""
     try:
-        old_name = request.get("old_name")
-        new_name = request.get("new_name")
-
-        if not old_name or not new_name:
-            raise HTTPException(status_code=400, detail="Both old_name and new_name are required")
-
-        return await file_converter.rename_exam_file(old_name, new_name)
+        return file_converter.rename_exam_file(request.old_name, request.new_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error renaming exam file: {str(e)}")
 
 # Delete exam file endpoint
 @app.post("/delete-exam")
-async def delete_exam(request: dict):
+def delete_exam(request: DeleteExamRequest):
     """Delete an exam file from the exams directory"""
     try:
-        exam_filename = request.get("exam_filename")
-
-        if not exam_filename:
-            raise HTTPException(status_code=400, detail="exam_filename is required")
-
-        return await file_converter.delete_exam_file(exam_filename)
+        return file_converter.delete_exam_file(request.exam_filename)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting exam file: {str(e)}")
 
@@ -232,24 +252,20 @@ async def delete_exam(request: dict):
 async def get_settings():
     """Get current configuration"""
     try:
-        return {
-            "success": True,
-            "config": config.get_all(),
-            "options": {
-                "omni_models": config.OMNI_MODELS,
-                "vision_models": config.VISION_MODELS,
-                "voice_options": config.VOICE_OPTIONS
-            }
-        }
+        # Both parts are pre-serialized; the config bytes are rebuilt only after a change
+        content = (
+            b'{"success":true,"config":' + config.get_all_json()
+            + b',"options":' + _SETTINGS_OPTIONS_BYTES + b'}'
+        )
+        return Response(content=content, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting settings: {str(e)}")
 
 @app.post("/settings")
-async def update_settings(request: dict):
+def update_settings(request: UpdateSettingsRequest):
     """Update configuration"""
     try:
-        new_config = request.get("config", {})
-        result = config.update(new_config)
+        result = config.update(request.config)
 
         if result["success"]:
             return result
@@ -261,12 +277,10 @@ async def update_settings(request: dict):
         raise HTTPException(status_code=500, detail=f"Error updating settings: {str(e)}")
 
 @app.post("/test-api")
-async def test_api_connection(request: dict):
+def test_api_connection(request: TestApiRequest):
     """Test API connection"""
     try:
-        api_key = request.get("api_key", "")
-        result = config.test_api_connection(api_key)
-        return result
+        return config.test_api_connection(request.api_key)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error testing API connection: {str(e)}")
 
@@ -284,23 +298,25 @@ async def get_available_voices(omni_model: str):
 if not os.environ.get('TAURI_MODE'):
     if getattr(sys, 'frozen', False):
         # Running as PyInstaller bundle - frontend files are in the bundled directory
-        bundled_frontend_path = Path(sys._MEIPASS) / "frontend" / "dist"
-        if bundled_frontend_path.exists():
-            app.mount("/", StaticFiles(directory=str(bundled_frontend_path), html=True), name="frontend")
-        else:
-            print(f"Warning: Frontend directory not found at {bundled_frontend_path}")
+        frontend_candidates = [Path(sys._MEIPASS) / "frontend" / "dist"]
     else:
-        # Development environment
-        frontend_path = paths.base_path / "frontend" / "dist"
-        if frontend_path.exists():
-            app.mount("/", StaticFiles(directory=str(frontend_path), html=True), name="frontend")
-        else:
-            # Fallback for development when running from source
-            dev_frontend_path = Path(__file__).parent.parent / "frontend" / "dist"
-            if dev_frontend_path.exists():
-                app.mount("/", StaticFiles(directory=str(dev_frontend_path), html=True), name="frontend")
+        # Development environment, falling back to the source tree
+        frontend_candidates = [
+            paths.base_path / "frontend" / "dist",
+            Path(__file__).parent.parent / "frontend" / "dist",
+        ]
+    frontend_path = next((p for p in frontend_candidates if p.exists()), None)
+    if frontend_path is not None:
+        app.mount("/", FrontendStaticFiles(directory=str(frontend_path), html=True), name="frontend")
+    elif getattr(sys, 'frozen', False):
+        logger.warning("Frontend directory not found at %s", frontend_candidates[0])
+
+# Error handlers
+@app.exception_handler(ExamError)
+async def exam_error_handler(request, exc: ExamError):
+    """Map exam session errors to their HTTP status code"""
+    return OrjsonResponse(status_code=exc.status_code, content={"detail": str(exc)})
 
-# Error handler
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """General exception handler"""
@@ -312,14 +328,3 @@ async def general_exception_handler(request, exc):
             "details": str(exc)
         }
     )
-
-# Run the application
-if __name__ == "__main__":    
-    # Run the server
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
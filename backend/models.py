@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -113,7 +113,16 @@ class FileConversionResponse(BaseModel):
     yaml_output: Optional[str] = None
     output_filename: Optional[str] = None
 
-class ErrorResponse(BaseModel):
-    error: str
-    message: str
-    details: Optional[Dict[str, Any]] = None
\ No newline at end of file
+class RenameExamRequest(BaseModel):
+    old_name: str = Field(min_length=1)
+    new_name: str = Field(min_length=1)
+
+class DeleteExamRequest(BaseModel):
+    exam_filename: str = Field(min_length=1)
+
+# Settings Models
+class UpdateSettingsRequest(BaseModel):
+    config: Dict[str, Any] = {}
+
+class TestApiRequest(BaseModel):
+    api_key: str = ""
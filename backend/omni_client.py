@@ -10,25 +10,96 @@ Audio comes in as base64encoded audio data; comes out as path of .mp3 file.
 """
 
 import os
+import re
+import logging
+import asyncio
 import aiohttp
-import base64
-import json
+import orjson
 import time
 import hashlib
 import numpy as np
 import ssl
+import string
+import tempfile
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import soundfile as sf
 from json_repair import repair_json
 try:
-    from .models import TTSResult, TTSInput, GradingInput, GradingResult, ConversionInput, ConversionResult, Question
-    from .config import config
-    from .paths import get_paths
+    # SIMD-accelerated, drop-in compatible; student recordings are several MB of base64
+    import pybase64 as base64
 except ImportError:
-    from models import TTSResult, TTSInput, GradingInput, GradingResult, ConversionInput, ConversionResult, Question
-    from config import config
-    from paths import get_paths
+    import base64
+from .models import TTSResult, TTSInput, GradingInput, GradingResult, ConversionInput, ConversionResult, Question
+from .config import config
+from .paths import get_paths
+
+# A child of uvicorn's error logger, so messages go to the server log at its level
+logger = logging.getLogger("uvicorn.error.omni_client")
+
+def _create_ssl_context() -> ssl.SSLContext:
+    """Create SSL context for PyInstaller compatibility"""
+    try:
+        # Try to use system certificates first
+        return ssl.create_default_context()
+    except Exception:
+        # Fallback to SSL verification disabled for PyInstaller environments
+        ssl_context = ssl.create_default_context()
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        return ssl_context
+
+# Loading the trust store is costly, so every client shares one context
+_SSL_CONTEXT = _create_ssl_context()
+
+# Sample rate of the PCM audio streamed back by the omni model
+_TTS_SAMPLE_RATE = 24000
+
+# Shared by every OmniClient so grading, TTS and file conversion together
+# never exceed the configured number of in-flight API requests
+_request_semaphore: Optional[asyncio.Semaphore] = None
+_request_semaphore_limit = 0
+
+def _get_request_semaphore() -> asyncio.Semaphore:
+    """Get the shared request semaphore, rebuilt when the configured limit changes"""
+    global _request_semaphore, _request_semaphore_limit
+    limit = config.clamp_max_concurrent_requests(config.get("api.max_concurrent_requests"))
+    if _request_semaphore is None or limit != _request_semaphore_limit:
+        _request_semaphore = asyncio.Semaphore(limit)
+        _request_semaphore_limit = limit
+    return _request_semaphore
+
+# A reply wrapped in a ``` or ```json code fence
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+def _strip_code_fence(text: str) -> str:
+    """Return the contents of a fenced code block, or the text unchanged"""
+    match = _CODE_FENCE_RE.match(text)
+    return match.group(1) if match else text
+
+def _parse_json_reply(text: str) -> Any:
+    """Parse a model's JSON reply, running the (slow, pure Python) json_repair only if it's malformed"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return orjson.loads(repair_json(text))
+
+async def _iter_sse_data(response: aiohttp.ClientResponse):
+    """Yield the raw payload of every SSE 'data:' line except the final [DONE]"""
+    # Split whatever has arrived with bytes.find instead of a readline() round trip per line;
+    # payloads stay bytes because orjson parses them directly
+    buffer = bytearray()
+    async for chunk in response.content.iter_any():
+        buffer.extend(chunk)
+        start = 0
+        while (newline := buffer.find(b"\n", start)) != -1:
+            line = bytes(buffer[start:newline])
+            start = newline + 1
+            if line.startswith(b"data: ") and not line.startswith(b"data: [DONE]"):
+                yield line[6:]
+        del buffer[:start]
+    if buffer.startswith(b"data: ") and not buffer.startswith(b"data: [DONE]"):
+        yield bytes(buffer[6:])
 
 class OmniClient:
     """Unified client for qwen3-omni-flash and qwen3-vl-plus models handling TTS, ASR, LLM, and vision functions"""
@@ -51,14 +122,85 @@ class OmniClient:
         self.prompts_dir = paths.prompts_dir
         self.prompts = self._load_prompts()
 
-    def _load_prompts(self) -> Dict[str, str]:
-        """Load all prompt templates from files."""
+        self._ssl_context = _SSL_CONTEXT
+
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        # Request fields that are the same for every call to this model
+        self._base_payload = {
+            "model": self.model,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+
+        # HTTP session shared by all requests of this client so connections stay
+        # alive between calls; created lazily because it must live on the event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+
+        # (text, voice) -> web path of clips known to be in the TTS cache
+        self._tts_web_paths: Dict[tuple, str] = {}
+        # TTS cache file name -> task generating it, while the API call is running
+        self._tts_inflight: Dict[str, asyncio.Task] = {}
+        # blake2b(prompt + student audio) -> parsed grading verdict
+        self._grading_cache: Dict[bytes, Dict[str, Any]] = {}
+
+        # Requests currently using the session, and whether get_omni_client has replaced this client
+        self._in_flight = 0
+        self._retired = False
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the pooled HTTP session"""
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                # Every call goes to one host, at most 16 at a time (api.max_concurrent_requests);
+                # keep idle connections longer than the default 15s since answers arrive minutes apart,
+                # and keep its DNS answer for 5 minutes rather than 10s
+                connector = aiohttp.TCPConnector(
+                    ssl=self._ssl_context,
+                    limit_per_host=16,
+                    keepalive_timeout=120,
+                    ttl_dns_cache=300
+                )
+                self._session = aiohttp.ClientSession(connector=connector)
+            return self._session
+
+    async def warm_up(self):
+        """Open a pooled connection to the API host so the first real request skips the handshakes"""
+        session = await self._get_session()
+        try:
+            async with session.head(self.base_url, allow_redirects=False, timeout=aiohttp.ClientTimeout(total=10)):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.info("Connection warm-up failed: %s", e)
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _load_prompts(self) -> Dict[str, Any]:
+        """Load all prompt templates from files, pre-parsed into (literal, field name) segments."""
         prompts = {}
+        formatter = string.Formatter()
         if self.prompts_dir.exists():
             for prompt_file in self.prompts_dir.glob("*.txt"):
                 prompt_name = prompt_file.stem
                 with open(prompt_file, 'r', encoding='utf-8') as f:
-                    prompts[prompt_name] = f.read().strip()
+                    template = f.read().strip()
+
+                segments = list(formatter.parse(template))
+                # Plain {name} fields are substituted directly; templates using
+                # format specs, conversions or indexing keep going through str.format
+                if all(field is None or (field.isidentifier() and not spec and conversion is None)
+                       for _, field, spec, conversion in segments):
+                    prompts[prompt_name] = [(literal, field) for literal, field, _, _ in segments]
+                else:
+                    prompts[prompt_name] = template
         return prompts
 
     def _get_prompt(self, prompt_name: str, **kwargs) -> str:
@@ -67,7 +209,15 @@ class OmniClient:
             raise ValueError(f"Prompt '{prompt_name}' not found")
 
         prompt = self.prompts[prompt_name]
-        return prompt.format(**kwargs)
+        if isinstance(prompt, str):
+            return prompt.format(**kwargs)
+
+        parts = []
+        for literal, field in prompt:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(kwargs[field]))
+        return "".join(parts)
 
     def _get_tts_cache_path(self, text: str, voice: str) -> Path:
         """Generate cache file path for TTS audio"""
@@ -86,9 +236,9 @@ class OmniClient:
     ) -> Dict[str, Any]:
         """
         Process unified request with qwen3-omni-flash or qwen3-vl-plus
-        Returns dict with text_response and optional base64encoded audio data
+        Returns dict with text_response and the decoded audio bytes (empty if none)
         """
-        print(f"Processing omni request: {text_prompt[:50]}...")
+        logger.info("Processing omni request: %.50s...", text_prompt)
 
         # Prepare the content array
         content = []
@@ -121,15 +271,13 @@ class OmniClient:
 
         # Prepare the request payload
         payload = {
-            "model": self.model,
+            **self._base_payload,
             "messages": [
                 {
                     "role": "user",
                     "content": content
                 }
-            ],
-            "stream": True,
-            "stream_options": {"include_usage": True}
+            ]
         }
 
         # Only add audio and modalities for audio-capable models
@@ -143,46 +291,33 @@ class OmniClient:
         if enable_thinking is not None:
             payload["extra_body"] = {"enable_thinking": enable_thinking}
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-
-        text_response = ""
-        audio_response = ""
+        text_parts = []  # streamed text deltas, joined once at the end
+        audio_chunks = []  # decoded audio, one entry per SSE chunk
+        audio_carry = ""  # trailing base64 characters that don't yet form a 4-char group
         usage_info = None
 
-        # Create SSL context for PyInstaller compatibility
+        # Counted so a client replaced after an API key change isn't closed mid-stream
+        self._in_flight += 1
         try:
-            # Try to use system certificates first
-            ssl_context = ssl.create_default_context()
-        except:
-            # Fallback to SSL verification disabled for PyInstaller environments
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=300.0)
-            ) as response:
-
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"API Error ({response.status}): {error_text}")
-                    raise Exception(f"API returned status {response.status}: {error_text}")
-
-                # Process streaming response
-                async for line in response.content:
-                    line = line.decode('utf-8').strip()
-
-                    if line.startswith("data: ") and line != "data: [DONE]":
+            session = await self._get_session()
+            async with _get_request_semaphore():
+                async with session.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self._headers,
+                    # orjson emits UTF-8 bytes directly; prompts and base64 media make this body large
+                    data=orjson.dumps(payload),
+                    timeout=aiohttp.ClientTimeout(total=300.0)
+                ) as response:
+
+                    if response.status != 200:
+                        error_text = await response.text()
+                        logger.error("API Error (%s): %s", response.status, error_text)
+                        raise Exception(f"API returned status {response.status}: {error_text}")
+
+                    # Process streaming response
+                    async for event in _iter_sse_data(response):
                         try:
-                            data = json.loads(line[6:])  # Remove "data: " prefix
+                            data = orjson.loads(event)
 
                             if data.get("choices"):
                                 delta = data["choices"][0].get("delta", {})
@@ -191,41 +326,69 @@ class OmniClient:
                                 if "audio" in delta:
                                     audio_data = delta["audio"]
                                     if "data" in audio_data:
-                                        audio_response += audio_data["data"]
+                                        # Decode as we go instead of growing one huge base64 string
+                                        encoded = audio_carry + audio_data["data"]
+                                        cut = len(encoded) - len(encoded) % 4
+                                        audio_chunks.append(base64.b64decode(encoded[:cut]))
+                                        audio_carry = encoded[cut:]
                                     elif "transcript" in audio_data:
-                                        print(f"Audio transcript: {audio_data['transcript']}")
+                                        logger.info("Audio transcript: %s", audio_data["transcript"])
 
                                 # Handle text data
                                 if "content" in delta and delta["content"]:
-                                    text_response += delta["content"]
+                                    text_parts.append(delta["content"])
 
                             # Handle usage stats
                             if data.get("usage"):
                                 usage_info = data["usage"]
 
-                        except json.JSONDecodeError as e:
-                            print(f"Failed to parse JSON: {line}")
+                        except orjson.JSONDecodeError as e:
+                            logger.warning("Failed to parse JSON: %r", event)
                             continue
-
-            return {
-                "text_response": text_response,
-                "audio_response": audio_response, # base64encoded audio data
-                "usage": usage_info
-            }
+        finally:
+            self._in_flight -= 1
+            if self._retired and self._in_flight == 0:
+                _close_retired_client(self)
+
+        if audio_carry:
+            audio_chunks.append(base64.b64decode(audio_carry + "=" * (-len(audio_carry) % 4)))
+
+        return {
+            "text_response": "".join(text_parts),
+            "audio_bytes": b"".join(audio_chunks),
+            "usage": usage_info
+        }
 
     async def text_to_speech(self, request: TTSInput) -> TTSResult:
         """Convert text to speech using qwen3-omni-flash"""
 
+        # Clips already seen on disk by this process skip the hash and the stat
+        web_path = self._tts_web_paths.get((request.text, request.voice))
+        if web_path is not None:
+            return TTSResult(text=request.text, audio_file_path=web_path)
+
         # Check cache first
         cache_path = self._get_tts_cache_path(request.text, request.voice)
         if cache_path.exists():
             # Return web-accessible path relative to /audio_cache mount point
             web_path = f"/audio_cache/tts/{cache_path.name}"
+            self._tts_web_paths[(request.text, request.voice)] = web_path
             return TTSResult(
                 text=request.text,
                 audio_file_path=web_path
             )
 
+        # Concurrent requests for the same clip share one API call
+        task = self._tts_inflight.get(cache_path.name)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_tts(request, cache_path))
+            self._tts_inflight[cache_path.name] = task
+            task.add_done_callback(lambda _: self._tts_inflight.pop(cache_path.name, None))
+        # Shielded so one caller being cancelled doesn't abort the others' clip
+        return await asyncio.shield(task)
+
+    async def _generate_tts(self, request: TTSInput, cache_path: Path) -> TTSResult:
+        """Request TTS audio from the API and write it to the cache"""
         # Prepare TTS prompt
         tts_prompt = self._get_prompt("text_to_speech", text=request.text)
 
@@ -237,14 +400,17 @@ class OmniClient:
             enable_thinking=False
         )
 
-        if result["audio_response"]:
-            # Cache the audio file
-            mp3_bytes = base64.b64decode(result["audio_response"])
-            audio_np = np.frombuffer(mp3_bytes, dtype=np.int16)
-            sf.write(cache_path, audio_np, samplerate=24000)
+        if result["audio_bytes"]:
+            # The streamed audio is headerless 16-bit mono PCM (the "wav" format in
+            # the payload only selects the codec family), so it has to be encoded
+            # before it is playable; frombuffer wraps the bytes without copying
+            pcm = np.frombuffer(result["audio_bytes"], dtype=np.int16)
+            # MP3 encoding is CPU-bound, so keep it off the event loop
+            await asyncio.to_thread(self._write_tts_clip, pcm, cache_path)
 
             # Return web-accessible path relative to /audio_cache mount point
             web_path = f"/audio_cache/tts/{cache_path.name}"
+            self._tts_web_paths[(request.text, request.voice)] = web_path
             return TTSResult(
                 text=request.text,
                 audio_file_path=web_path
@@ -252,8 +418,29 @@ class OmniClient:
         else:
             raise Exception("No audio response received from TTS request")
 
-    def _cache_student_audio(self, base64_audio: str, session_id: str, question_id: str) -> Path:
+    def _write_tts_clip(self, pcm: np.ndarray, cache_path: Path):
+        """Encode PCM to MP3 under a temporary name, then move it into place"""
+        # The cache is keyed only on the file existing, so a crash mid-encode
+        # must never leave a truncated clip under the final name
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".part")
+        os.close(fd)
+        try:
+            sf.write(tmp_path, pcm, samplerate=_TTS_SAMPLE_RATE, format="MP3")
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    async def _cache_student_audio(self, base64_audio: str, session_id: str, question_id: str) -> Path:
         """Cache student audio - save as MP3 for playback"""
+        # Decoding and writing several MB would otherwise stall every other stream on the loop
+        return await asyncio.to_thread(self._write_student_audio, base64_audio, session_id, question_id)
+
+    def _write_student_audio(self, base64_audio: str, session_id: str, question_id: str) -> Path:
+        """Decode student audio and write it to the session's answer folder"""
         audio_bytes = base64.b64decode(base64_audio)
         session_dir = self.student_audio_dir / session_id
         session_dir.mkdir(exist_ok=True)
@@ -264,55 +451,73 @@ class OmniClient:
         with open(mp3_path, 'wb') as f:
             f.write(audio_bytes)
 
-        print(f"✅ Cached student MP3 audio: {mp3_path}")
+        logger.info("Cached student MP3 audio: %s", mp3_path)
         return mp3_path
 
+    async def _await_student_audio(self, audio_task: asyncio.Task) -> Optional[str]:
+        """Wait for the student audio write, returning its path or None if it failed"""
+        (result,) = await asyncio.gather(audio_task, return_exceptions=True)
+        if isinstance(result, BaseException):
+            logger.warning("Failed to cache student audio: %s", result)
+            return None
+        return str(result)
+
+    async def _request_grading(self, grading_prompt: str, base64_audio: Optional[str]) -> Dict[str, Any]:
+        """Send a grading prompt (plus the student's audio, if any) and parse the JSON verdict"""
+        # Resubmitting the same recording to the same prompt reuses the earlier verdict
+        hasher = hashlib.blake2b(grading_prompt.encode(), digest_size=16)
+        if base64_audio:
+            hasher.update(b"\0")
+            hasher.update(base64_audio.encode())
+        cache_key = hasher.digest()
+        cached = self._grading_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        result = await self._process_omni_request(
+            text_prompt=grading_prompt,
+            base64_audio=base64_audio,
+            output_modalities=["text"],
+            enable_thinking=True
+        )
+
+        response_text = _strip_code_fence(result["text_response"].strip())
+        grading_data = _parse_json_reply(response_text)
+        # Only keep usable verdicts so a malformed reply is retried next time
+        if isinstance(grading_data, dict) and "score" in grading_data:
+            self._grading_cache[cache_key] = dict(grading_data)
+        return grading_data
+
     async def _grade_read_aloud(self, request: GradingInput) -> GradingResult:
         """Grade student answer for read-aloud questions"""
-        # Cache student audio for debugging/review
-        audio_path = self._cache_student_audio(request.student_answer_audio, request.session_id, request.question_id)
-
         # Prepare grading prompt for read-aloud
         grading_prompt = self._get_prompt("read_aloud_grading", question_text=request.question_text)
 
+        # Cache student audio for debugging/review, writing it while the model grades
+        audio_task = asyncio.create_task(
+            self._cache_student_audio(request.student_answer_audio, request.session_id, request.question_id)
+        )
+
         # Process request
         try:
-            result = await self._process_omni_request(
-                text_prompt=grading_prompt,
-                base64_audio=request.student_answer_audio,
-                output_modalities=["text"],
-                enable_thinking=True
-            )
-
-            # Parse and repair JSON response
-            response_text = result["text_response"].strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:-3]
-            elif response_text.startswith("```"):
-                response_text = response_text[3:-3]
-
-            repaired_json = repair_json(response_text)
-            grading_data = json.loads(repaired_json)
-
-            return GradingResult(
-                score=float(grading_data["score"]),
-                feedback=grading_data["feedback"],
-                explanation=grading_data["explanation"],
-                student_audio_path=str(audio_path)
-            )
-        except:
-            return GradingResult(
-                score=0.0,
-                feedback="Grading failed",
-                explanation="Technical issue with AI processing"
-            )
+            grading_data = await self._request_grading(grading_prompt, request.student_answer_audio)
+        finally:
+            # Also awaited when grading fails, so a failed write is logged rather than left unretrieved
+            audio_path = await self._await_student_audio(audio_task)
+
+        return GradingResult(
+            score=float(grading_data["score"]),
+            feedback=grading_data["feedback"],
+            explanation=grading_data["explanation"],
+            student_audio_path=audio_path
+        )
 
     async def _grade_multiple_choice(self, request: GradingInput) -> GradingResult:
         """Grade student answer for multiple-choice questions"""
         student_answer = request.student_answer_text
 
         # Prepare grading prompt for multiple choice
-        options_text = chr(10).join(request.options) if request.options else 'No options provided'
+        options_text = "\n".join(request.options) if request.options else 'No options provided'
         grading_prompt = self._get_prompt("multiple_choice_grading",
                                          question_text=request.question_text,
                                          options=options_text,
@@ -320,118 +525,62 @@ class OmniClient:
                                          student_answer=student_answer)
 
         # Process request
-        try:
-            result = await self._process_omni_request(
-                text_prompt=grading_prompt,
-                base64_audio=request.student_answer_audio,
-                output_modalities=["text"],
-                enable_thinking=True
-            )
+        grading_data = await self._request_grading(grading_prompt, request.student_answer_audio)
 
-            # Parse and repair JSON response
-            response_text = result["text_response"].strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:-3]
-            elif response_text.startswith("```"):
-                response_text = response_text[3:-3]
-
-            repaired_json = repair_json(response_text)
-            grading_data = json.loads(repaired_json)
-
-            return GradingResult(
-                score=float(grading_data["score"]),
-                feedback=grading_data["feedback"],
-                explanation=grading_data["explanation"],
-                student_answer=student_answer
-            )
-        except:
-            return GradingResult(
-                score=0.0,
-                feedback="Grading failed",
-                explanation="Technical issue with AI processing"
-            )
+        return GradingResult(
+            score=float(grading_data["score"]),
+            feedback=grading_data["feedback"],
+            explanation=grading_data["explanation"],
+            student_answer=student_answer
+        )
 
     async def _grade_quick_response(self, request: GradingInput) -> GradingResult:
         """Grade student answer for quick-response questions"""
-        # Cache student audio for debugging/review
-        audio_path = self._cache_student_audio(request.student_answer_audio, request.session_id, request.question_id)
-
         # Prepare grading prompt for quick response
         grading_prompt = self._get_prompt("quick_response_grading", question_text=request.question_text)
 
+        # Cache student audio for debugging/review, writing it while the model grades
+        audio_task = asyncio.create_task(
+            self._cache_student_audio(request.student_answer_audio, request.session_id, request.question_id)
+        )
+
         # Process request
         try:
-            result = await self._process_omni_request(
-                text_prompt=grading_prompt,
-                base64_audio=request.student_answer_audio,
-                output_modalities=["text"],
-                enable_thinking=True
-            )
-
-            # Parse the JSON response
-            import json
-            response_text = result["text_response"].strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:-3]
-            elif response_text.startswith("```"):
-                response_text = response_text[3:-3]
-
-            grading_data = json.loads(response_text)
-
-            return GradingResult(
-                score=float(grading_data["score"]),
-                feedback=grading_data["feedback"],
-                explanation=grading_data["explanation"],
-                suggested_answer=grading_data.get("suggested_answer"),
-                student_audio_path=str(audio_path)
-            )
-        except:
-            return GradingResult(
-                score=0.0,
-                feedback="Grading failed",
-                explanation="Technical issue with AI processing"
-            )
+            grading_data = await self._request_grading(grading_prompt, request.student_answer_audio)
+        finally:
+            audio_path = await self._await_student_audio(audio_task)
+
+        return GradingResult(
+            score=float(grading_data["score"]),
+            feedback=grading_data["feedback"],
+            explanation=grading_data["explanation"],
+            suggested_answer=grading_data.get("suggested_answer"),
+            student_audio_path=audio_path
+        )
 
     async def _grade_translation(self, request: GradingInput) -> GradingResult:
         """Grade student answer for translation questions"""
-        # Cache student audio for debugging/review
-        audio_path = self._cache_student_audio(request.student_answer_audio, request.session_id, request.question_id)
-
         # Prepare grading prompt for translation
         grading_prompt = self._get_prompt("translation_grading", question_text=request.question_text)
 
+        # Cache student audio for debugging/review, writing it while the model grades
+        audio_task = asyncio.create_task(
+            self._cache_student_audio(request.student_answer_audio, request.session_id, request.question_id)
+        )
+
         # Process request
         try:
-            result = await self._process_omni_request(
-                text_prompt=grading_prompt,
-                base64_audio=request.student_answer_audio,
-                output_modalities=["text"],
-                enable_thinking=True
-            )
-
-            # Parse the JSON response
-            import json
-            response_text = result["text_response"].strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:-3]
-            elif response_text.startswith("```"):
-                response_text = response_text[3:-3]
-
-            grading_data = json.loads(response_text)
-
-            return GradingResult(
-                score=float(grading_data["score"]),
-                feedback=grading_data["feedback"],
-                explanation=grading_data["explanation"],
-                suggested_answer=grading_data.get("suggested_answer"),
-                student_audio_path=str(audio_path)
-            )
-        except:
-            return GradingResult(
-                score=0.0,
-                feedback="Grading failed",
-                explanation="Technical issue with AI processing"
-            )
+            grading_data = await self._request_grading(grading_prompt, request.student_answer_audio)
+        finally:
+            audio_path = await self._await_student_audio(audio_task)
+
+        return GradingResult(
+            score=float(grading_data["score"]),
+            feedback=grading_data["feedback"],
+            explanation=grading_data["explanation"],
+            suggested_answer=grading_data.get("suggested_answer"),
+            student_audio_path=audio_path
+        )
 
     async def convert_files_to_questions(self, request: ConversionInput) -> ConversionResult:
         """Convert files to exam questions using vision model"""
@@ -455,19 +604,15 @@ class OmniClient:
         result = await self._process_omni_request(
             text_prompt=full_prompt,
             base64_images=base64_images,
+            output_modalities=["text"],
             enable_thinking=True
         )
 
         # Parse the JSON response
-        response_text = result["text_response"].strip()
-        if response_text.startswith("```json"):
-            response_text = response_text[7:-3]
-        elif response_text.startswith("```"):
-            response_text = response_text[3:-3]
+        response_text = _strip_code_fence(result["text_response"].strip())
 
-        # Repair and parse JSON
-        repaired_json = repair_json(response_text)
-        conversion_data = json.loads(repaired_json)
+        # Parse JSON, repairing it if needed
+        conversion_data = _parse_json_reply(response_text)
 
         # Convert to Question objects
         questions = []
@@ -487,22 +632,76 @@ class OmniClient:
             extracted_questions=questions
         )
 
+    # Question type -> grader method
+    _GRADERS = {
+        "read_aloud": _grade_read_aloud,
+        "multiple_choice": _grade_multiple_choice,
+        "quick_response": _grade_quick_response,
+        "translation": _grade_translation,
+    }
+
     async def grade_answer(self, request: GradingInput) -> GradingResult:
         """Grade student answer based on question type"""
-        if request.question_type == "read_aloud":
-            return await self._grade_read_aloud(request)
-        elif request.question_type == "multiple_choice":
-            return await self._grade_multiple_choice(request)
-        elif request.question_type == "quick_response":
-            return await self._grade_quick_response(request)
-        elif request.question_type == "translation":
-            return await self._grade_translation(request)
-        else:
+        grader = self._GRADERS.get(request.question_type)
+        if grader is None:
             return GradingResult(
                 score=0.0,
                 feedback="Unknown question type",
                 explanation="Unable to grade due to unknown question type",
             )
+        try:
+            return await grader(self, request)
+        except Exception as e:
+            # Request or parse failures become a zero score; cancellation still propagates
+            logger.warning("Grading failed for question %s: %s", request.question_id, e)
+            return GradingResult(
+                score=0.0,
+                feedback="Grading failed",
+                explanation="Technical issue with AI processing"
+            )
+
+# Clients shared by the whole app, one per model, all using the currently configured API key
+_clients: Dict[str, OmniClient] = {}
+# Clients replaced after an API key change, kept until their last request finishes
+_retired_clients: set = set()
+# Background close() tasks of retired clients, referenced until they finish
+_closing: set = set()
+
+def _close_retired_client(client: OmniClient):
+    """Close a retired client's session in the background"""
+    _retired_clients.discard(client)
+    task = asyncio.get_running_loop().create_task(client.close())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+def get_omni_client(model: str) -> OmniClient:
+    """Get the shared client for a model, created for the currently configured API key"""
+    # Grading, TTS and conversion on the same model share one connection pool and cache.
+    # After an API key change in settings, clients built for the old key are dropped so the
+    # next call uses the new key; each one's session is closed once its in-flight requests finish
+    api_key = config.get("api.dashscope_key")
+    for stale_model in [m for m, c in _clients.items() if c.api_key != api_key]:
+        stale = _clients.pop(stale_model)
+        stale._retired = True
+        _retired_clients.add(stale)
+        if stale._in_flight == 0:
+            _close_retired_client(stale)
+
+    client = _clients.get(model)
+    if client is None:
+        client = OmniClient(model)
+        _clients[model] = client
+    return client
+
+async def close_omni_clients():
+    """Close the HTTP sessions of every shared client"""
+    clients = list(_clients.values()) + list(_retired_clients)
+    _clients.clear()
+    _retired_clients.clear()
+    for client in clients:
+        await client.close()
+    # Let closes of retired clients finish before the loop stops
+    await asyncio.gather(*_closing, return_exceptions=True)
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
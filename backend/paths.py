@@ -5,13 +5,30 @@ Handles runtime path resolution for both development and packaged environments.
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 
+@lru_cache(maxsize=1)
+def get_app_data_path() -> Path:
+    """Get the per-user application data directory used by the packaged app."""
+    if os.name == 'nt':  # Windows
+        appdata = os.environ.get('LOCALAPPDATA')
+        if appdata:
+            return Path(appdata) / "Echo"
+        else:
+            return Path.home() / "AppData" / "Local" / "Echo"
+    else:
+        return Path.home() / ".echo"
+
+
 class AppPaths:
     """Centralized path management for Echo application."""
 
+    # Base paths whose directory tree has already been created in this process
+    _ensured: set = set()
+
     def __init__(self, base_path: Optional[Path] = None):
         if base_path:
             self.base_path = base_path
@@ -34,22 +51,18 @@ class AppPaths:
         """Get the base path for application data."""
         if getattr(sys, 'frozen', False):
             # Running as PyInstaller bundle
-            if os.name == 'nt':  # Windows
-                appdata = os.environ.get('LOCALAPPDATA')
-                if appdata:
-                    return Path(appdata) / "Echo"
-                else:
-                    return Path.home() / "AppData" / "Local" / "Echo"
-            else:
-                return Path.home() / ".echo"
+            return get_app_data_path()
         else:
             # Running in development environment
             return Path(__file__).parent.parent
 
     def _ensure_directories(self):
         """Create necessary directories if they don't exist."""
+        if self.base_path in AppPaths._ensured:
+            return
+
+        # Only the leaves; parents=True creates base_path and audio_cache along the way
         directories = [
-            self.audio_cache,
             self.student_answers,
             self.tts_cache,
             self.exams_dir,
@@ -59,6 +72,8 @@ class AppPaths:
         for directory in directories:
             directory.mkdir(parents=True, exist_ok=True)
 
+        AppPaths._ensured.add(self.base_path)
+
     def copy_default_files(self, source_base: Path):
         """Copy default files from bundled resources."""
         # Copy default config if it doesn't exist
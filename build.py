@@ -10,99 +10,117 @@ import sys
 import argparse
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_command(cmd, description):
+def run_command(cmd, description, cwd=None):
     """Run a command and handle errors."""
     print(f"\n{'='*50}")
     print(f"Step: {description}")
     print(f"Command: {' '.join(cmd) if isinstance(cmd, list) else cmd}")
     print('='*50)
 
-    try:
-        result = subprocess.run(cmd, check=True, shell=isinstance(cmd, str),
-                              capture_output=True, text=True)
-        print("Success!")
-        if result.stdout:
-            print("STDOUT:", result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
+    # Stream output line by line so long npm/PyInstaller steps show progress live
+    process = subprocess.Popen(cmd, shell=isinstance(cmd, str), cwd=cwd, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, text=True, bufsize=1)
+    for line in process.stdout:
+        sys.stdout.write(line)
+
+    if process.wait() != 0:
         print("Failed!")
-        print("STDOUT:", e.stdout)
-        print("STDERR:", e.stderr)
         return False
+    print("Success!")
+    return True
+
+def get_tool_version(cmd):
+    """Return a tool's version output, or None if it is not installed."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return result.stdout.strip()
+    except OSError:
+        return None
 
 def check_prerequisites(tauri=False):
     """Check if all prerequisites are installed."""
     print("Checking prerequisites...")
 
+    checks = {
+        "Python": [sys.executable, '--version'],
+        "Node.js": ['node', '--version'],
+        "npm": ['npm', '--version'],
+        "PyInstaller": ['pyinstaller', '--version'],
+    }
+    if tauri:
+        checks["Cargo"] = ['cargo', '--version']
+
+    # The checks are independent process launches, so run them side by side
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        versions = dict(zip(checks, executor.map(get_tool_version, checks.values())))
+
     # Check Python
-    try:
-        result = subprocess.run([sys.executable, '--version'], capture_output=True, text=True)
-        print(f"  Python: {result.stdout.strip()}")
-    except:
+    if versions["Python"] is None:
         print("  Python not found")
         return False
+    print(f"  Python: {versions['Python']}")
 
     # Check Node.js
-    try:
-        result = subprocess.run(['node', '--version'], capture_output=True, text=True)
-        print(f"  Node.js: {result.stdout.strip()}")
-    except:
+    if versions["Node.js"] is None:
         print("  Node.js not found - required for frontend build")
         return False
+    print(f"  Node.js: {versions['Node.js']}")
 
     # Check npm
-    try:
-        result = subprocess.run(['npm', '--version'], capture_output=True, text=True)
-        print(f"  npm: {result.stdout.strip()}")
-    except:
+    if versions["npm"] is None:
         print("  npm not found - required for frontend build")
         return False
+    print(f"  npm: {versions['npm']}")
 
     # Check PyInstaller
-    try:
-        result = subprocess.run(['pyinstaller', '--version'], capture_output=True, text=True)
-        print(f"  PyInstaller: {result.stdout.strip()}")
-    except:
+    if versions["PyInstaller"] is None:
         print("  PyInstaller not found - installing...")
         if not run_command([sys.executable, '-m', 'pip', 'install', 'pyinstaller'], "Installing PyInstaller"):
             return False
+    else:
+        print(f"  PyInstaller: {versions['PyInstaller']}")
 
     if tauri:
         # Check Rust/Cargo
-        try:
-            result = subprocess.run(['cargo', '--version'], capture_output=True, text=True)
-            print(f"  Cargo: {result.stdout.strip()}")
-        except:
+        if versions["Cargo"] is None:
             print("  Cargo not found - required for Tauri build")
             return False
+        print(f"  Cargo: {versions['Cargo']}")
 
     return True
 
+def dependencies_up_to_date(frontend_dir):
+    """Check whether node_modules is newer than package-lock.json, as npm itself does."""
+    installed_lock = frontend_dir / "node_modules" / ".package-lock.json"
+    package_lock = frontend_dir / "package-lock.json"
+    if not installed_lock.exists() or not package_lock.exists():
+        return False
+    return installed_lock.stat().st_mtime >= package_lock.stat().st_mtime
+
 def build_frontend():
     """Build the Vue.js frontend."""
     print("\nBuilding frontend...")
 
-    # Change to frontend directory
+    # Locate frontend directory
     frontend_dir = Path("frontend")
     if not frontend_dir.exists():
         print("  Frontend directory not found")
         return False
 
-    os.chdir(frontend_dir)
-
     # Install dependencies
-    if not run_command("npm install", "Installing frontend dependencies"):
+    if dependencies_up_to_date(frontend_dir):
+        print("  Frontend dependencies up to date, skipping npm install")
+    elif not run_command("npm install --no-audit --no-fund --prefer-offline", "Installing frontend dependencies",
+                         cwd=frontend_dir):
         return False
 
     # Build the application
-    if not run_command("npm run build", "Building Vue.js application"):
+    if not run_command("npm run build", "Building Vue.js application", cwd=frontend_dir):
         return False
 
-    # Change back to project root
-    os.chdir("..")
-
     # Check if dist was created
     if not (frontend_dir / "dist").exists():
         print("  Frontend build failed - dist directory not created")
@@ -111,7 +129,7 @@ def build_frontend():
     print("  Frontend build completed")
     return True
 
-def build_executable():
+def build_executable(clean=False):
     """Build the executable with PyInstaller."""
     print("\nBuilding executable...")
 
@@ -123,12 +141,16 @@ def build_executable():
         print("Cleaning previous dist directory...")
         shutil.rmtree(dist_dir)
 
-    if build_dir.exists():
+    # build/ holds PyInstaller's analysis cache, which makes rebuilds much faster
+    if clean and build_dir.exists():
         print("Cleaning previous build directory...")
         shutil.rmtree(build_dir)
 
     # Run PyInstaller
-    if not run_command("pyinstaller echo.spec --clean --noconfirm", "Building executable"):
+    command = "pyinstaller echo.spec --noconfirm"
+    if clean:
+        command += " --clean"
+    if not run_command(command, "Building executable"):
         return False
 
     # Check if executable was created
@@ -156,7 +178,11 @@ def create_portable_package():
     # Copy executable
     executable_name = "echo.exe" if os.name == 'nt' else "echo"
     executable_path = dist_dir / executable_name
-    shutil.copy2(executable_path, portable_dir / executable_name)
+    # Hard link when possible; the portable dir sits next to the executable in dist/
+    try:
+        os.link(executable_path, portable_dir / executable_name)
+    except OSError:
+        shutil.copy2(executable_path, portable_dir / executable_name)
 
     # Copy documentation
     readme_files = ["README.md"]
@@ -192,14 +218,9 @@ def build_tauri_app():
     """Build the Tauri application."""
     print("\nBuilding Tauri application...")
 
-    os.chdir("frontend")
-
-    if not run_command("npx tauri build", "Building Tauri app"):
-        os.chdir("..")
+    if not run_command("npx tauri build", "Building Tauri app", cwd="frontend"):
         return False
 
-    os.chdir("..")
-
     print("  Tauri app built successfully")
     return True
 
@@ -208,6 +229,8 @@ def main():
     parser = argparse.ArgumentParser(description="Echo Build Script")
     parser.add_argument('--tauri', action='store_true',
                         help='Build as Tauri app instead of standalone PyInstaller exe')
+    parser.add_argument('--clean', action='store_true',
+                        help='Discard cached PyInstaller build artifacts before building')
     args = parser.parse_args()
 
     print("Echo Build Script")
@@ -239,7 +262,7 @@ def main():
             print("Frontend build failed")
             sys.exit(1)
 
-        if not build_executable():
+        if not build_executable(clean=args.clean):
             print("Executable build failed")
             sys.exit(1)
 
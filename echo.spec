@@ -31,6 +31,8 @@ a = Analysis(
         'docx',
         'json_repair',
         'uvicorn',
+        'uvloop',
+        'httptools',
         'fastapi',
         'pydantic',
         'pathlib',
@@ -83,7 +85,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # UPX-packed binaries have to be unpacked on every launch
     upx_exclude=[],
     runtime_tmpdir=None,
     console=True,  # Show console for debugging
@@ -9,10 +9,7 @@ import argparse
 import webbrowser
 import threading
 import time
-import signal
 from pathlib import Path
-import uvicorn
-import certifi
 
 # Add the project root to Python path
 if getattr(sys, 'frozen', False):
@@ -22,29 +19,18 @@ else:
     # Running in development environment
     project_root = Path(__file__).parent
 
-sys.path.insert(0, str(project_root))
-
-
-def get_app_data_path():
-    """Get the application data directory for Echo."""
-    if os.name == 'nt':  # Windows
-        appdata = os.environ.get('LOCALAPPDATA')
-        if appdata:
-            return Path(appdata) / "Echo"
-        else:
-            return Path.home() / "AppData" / "Local" / "Echo"
-    else:
-        return Path.home() / ".echo"
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 
 def setup_directories():
     """Create necessary directories in AppData and copy default files."""
+    # Import path management
+    from backend.paths import get_app_data_path, initialize_paths
+
     app_data = get_app_data_path()
     print(f"Setting up Echo in: {app_data}")
 
-    # Import path management
-    from backend.paths import initialize_paths
-
     # Initialize paths with AppData location
     paths = initialize_paths(base_path=app_data)
 
@@ -55,26 +41,62 @@ def setup_directories():
     return paths
 
 
+def _is_port_available(port):
+    """Check that a port can be bound and that nothing is already answering on it."""
+    import socket
+
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(('127.0.0.1', port))
+    except OSError:
+        return False
+
+    # A bind can succeed next to a listener on another address (or via
+    # SO_REUSEADDR on Windows), so also make sure a connection is refused
+    try:
+        with socket.create_connection(('127.0.0.1', port), timeout=0.05):
+            return False
+    except OSError:
+        return True
+
+
 def find_available_port(start_port=8000, max_attempts=10):
     """Find an available port starting from start_port."""
     import socket
 
+    # Prefer the usual ports so the browser origin (and its local storage) stays the same
     for port in range(start_port, start_port + max_attempts):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            sock.bind(('127.0.0.1', port))
-            sock.close()
+        if _is_port_available(port):
             return port
-        except OSError:
-            continue
 
-    return start_port  # Return original if none found
+    # All taken - let the OS pick a free port instead of returning one that's in use
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, cancelled, timeout=30):
+    """Poll the server port until it accepts connections, the timeout expires or startup is cancelled."""
+    import socket
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not cancelled.is_set():
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.1):
+                return True
+        except OSError:
+            cancelled.wait(0.05)
+    return False
 
 
-def launch_browser(port):
-    """Launch web browser after a short delay."""
+def launch_browser(port, cancelled):
+    """Launch web browser once the server is accepting connections, unless startup is cancelled."""
     def delayed_launch():
-        time.sleep(3)  # Wait for server to fully start
+        # Open as soon as uvicorn is listening instead of guessing a fixed delay
+        if not wait_for_server(port, cancelled):
+            if cancelled.is_set():
+                return
+            print("Server did not start in time, opening browser anyway")
         try:
             webbrowser.open(f'http://127.0.0.1:{port}')
             print(f"Browser launched at http://127.0.0.1:{port}")
@@ -86,17 +108,6 @@ def launch_browser(port):
     browser_thread.start()
 
 
-def setup_signal_handler():
-    """Setup signal handler for graceful shutdown."""
-    def signal_handler(signum, frame):
-        print("\nShutting down Echo gracefully...")
-        sys.exit(0)
-
-    if os.name != 'nt':  # Unix-like systems
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-
-
 def parse_args():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Echo Application Launcher")
@@ -122,15 +133,17 @@ def main():
 
     # Set up SSL certificates for HTTPS connections
     try:
-        os.environ['SSL_CERT_FILE'] = certifi.where()
-        print(f"Using SSL certificates from: {certifi.where()}")
+        import certifi
+        cert_path = certifi.where()
+        os.environ['SSL_CERT_FILE'] = cert_path
+        print(f"Using SSL certificates from: {cert_path}")
     except Exception as e:
         print(f"Warning: Could not set SSL certificates: {e}")
 
-    try:
-        # Setup signal handling
-        setup_signal_handler()
+    # Set if startup fails, so the browser thread doesn't open a dead page
+    startup_failed = threading.Event()
 
+    try:
         # Setup directories and copy default files
         print("Setting up directories...")
         paths = setup_directories()
@@ -149,19 +162,18 @@ def main():
         print(f"Changing working directory to: {paths.base_path}")
         os.chdir(paths.base_path)
 
-        # Add project root to Python path for imports
-        sys.path.insert(0, str(project_root))
-        print(f"Project root added to Python path: {project_root}")
+        print(f"Project root on Python path: {project_root}")
+
+        # Launch browser in separate thread (skip in Tauri mode). Started before
+        # the app import so its readiness poll overlaps the import time
+        if not args.tauri:
+            launch_browser(port, startup_failed)
 
         # Import the app directly to avoid string import issues
         print("Importing FastAPI app...")
         from backend.main import app
         print("FastAPI app imported successfully")
 
-        # Launch browser in separate thread (skip in Tauri mode)
-        if not args.tauri:
-            launch_browser(port)
-
         # Print startup message
         print("=" * 50)
         print("Echo is starting up...")
@@ -171,19 +183,26 @@ def main():
             print("Press Ctrl+C to stop the server")
         print("=" * 50)
 
-        # Run the server with direct app reference
-        uvicorn.run(
+        # Run the server with direct app reference. uvicorn installs its own
+        # SIGINT/SIGTERM (and SIGBREAK on Windows) handlers while serving, which
+        # drain connections and run the app's shutdown before run() returns
+        import uvicorn
+        server = uvicorn.Server(uvicorn.Config(
             app,
             host="127.0.0.1",
             port=port,
             log_level="info",
             reload=False,  # Disable reload in packaged version
             access_log=False  # Reduce log noise
-        )
+        ))
+        server.run()
+        print("Echo stopped")
 
     except KeyboardInterrupt:
+        startup_failed.set()
         print("\nEcho stopped by user")
     except Exception as e:
+        startup_failed.set()
         print(f"\n" + "="*50)
         print(f"ERROR starting Echo: {e}")
         print("="*50)
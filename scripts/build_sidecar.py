@@ -5,6 +5,7 @@ Build the Echo sidecar binary and copy it to src-tauri/binaries/ with the correc
 
 import os
 import sys
+import hashlib
 import platform
 import shutil
 import subprocess
@@ -34,6 +35,31 @@ def get_target_triple():
         raise RuntimeError(f'Unsupported platform: {system} {machine}')
 
 
+# Everything sidecar.spec bundles, plus the dependency lock as a stand-in for site-packages
+SOURCE_INPUTS = [
+    'sidecar.spec', 'launcher.py', 'backend', 'prompts', 'exams',
+    'audio_cache/tts/audio-test.mp3', 'config.yaml.example', 'pyproject.toml', 'uv.lock',
+]
+
+
+def hash_sources(project_root):
+    """Fingerprint the sidecar inputs by path, size and mtime (contents aren't read)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in SOURCE_INPUTS:
+        path = project_root / name
+        if path.is_dir():
+            files = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = [d for d in dirnames if d != '__pycache__']
+                files.extend(Path(dirpath) / f for f in filenames)
+        else:
+            files = [path] if path.exists() else []
+        for file in sorted(files):
+            stat = file.stat()
+            digest.update(f'{file.relative_to(project_root)}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+    return digest.hexdigest()
+
+
 def main():
     project_root = Path(__file__).parent.parent
     os.chdir(project_root)
@@ -41,36 +67,51 @@ def main():
     print('Building Echo sidecar binary...')
     print(f'Project root: {project_root}')
 
+    exe_ext = '.exe' if platform.system() == 'Windows' else ''
+    target_triple = get_target_triple()
+    binaries_dir = project_root / 'frontend' / 'src-tauri' / 'binaries'
+    dest = binaries_dir / f'echo-backend-{target_triple}{exe_ext}'
+
+    # Skip PyInstaller when nothing it bundles has changed since the last build.
+    # Delete the .hash file next to the binary to force a rebuild
+    hash_file = binaries_dir / f'.echo-backend-{target_triple}.hash'
+    source_hash = hash_sources(project_root)
+    if dest.exists() and hash_file.exists() and hash_file.read_text().strip() == source_hash:
+        print(f'Sources unchanged, keeping existing sidecar binary: {dest}')
+        return
+
     # Run PyInstaller with sidecar spec
-    result = subprocess.run(
+    # Echo the log as it is produced rather than holding it until PyInstaller exits
+    process = subprocess.Popen(
         ['pyinstaller', 'sidecar.spec', '--clean', '--noconfirm'],
-        capture_output=True, text=True
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
     )
+    for line in process.stdout:
+        sys.stdout.write(line)
 
-    if result.returncode != 0:
+    if process.wait() != 0:
         print('PyInstaller failed!')
-        print('STDOUT:', result.stdout)
-        print('STDERR:', result.stderr)
         sys.exit(1)
 
     print('PyInstaller build succeeded.')
 
-    # Determine source and destination paths
-    exe_ext = '.exe' if platform.system() == 'Windows' else ''
+    # Determine source path
     source = project_root / 'dist' / f'echo-backend{exe_ext}'
 
     if not source.exists():
         print(f'ERROR: Built binary not found at {source}')
         sys.exit(1)
 
-    target_triple = get_target_triple()
-    binaries_dir = project_root / 'frontend' / 'src-tauri' / 'binaries'
     binaries_dir.mkdir(parents=True, exist_ok=True)
 
-    dest = binaries_dir / f'echo-backend-{target_triple}{exe_ext}'
-
-    print(f'Copying {source} -> {dest}')
-    shutil.copy2(source, dest)
+    # Nothing else uses the dist/ copy, so move it when both paths share a
+    # filesystem. copy2 already uses in-kernel copies where the OS has them
+    print(f'Moving {source} -> {dest}')
+    try:
+        os.replace(source, dest)
+    except OSError:
+        shutil.copy2(source, dest)
+    hash_file.write_text(source_hash)
 
     print(f'Sidecar binary ready: {dest}')
 
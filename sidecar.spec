@@ -27,10 +27,13 @@ a = Analysis(
         'uvicorn.protocols',
         'uvicorn.protocols.http',
         'uvicorn.protocols.http.auto',
+        'uvicorn.protocols.http.httptools_impl',
         'uvicorn.protocols.websockets',
         'uvicorn.protocols.websockets.auto',
         'uvicorn.lifespan',
         'uvicorn.lifespan.on',
+        'uvloop',
+        'httptools',
     ],
     hookspath=[],
     hooksconfig={},